@@ -1,6 +1,3 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import unquote, urlparse, parse_qs
 import time
 import re
@@ -12,6 +9,8 @@ class ArtistInfoExtractor:
     
     def scrape_artist_info(self, artist_url: str) -> Dict:
         """Scrape contact information from an artist's SoundCloud profile."""
+        from selenium.webdriver.common.by import By
+        
         try:
             print(f"Scraping artist info from: {artist_url}")
             
@@ -126,18 +125,7 @@ class ArtistInfoExtractor:
             
             # Extract email from bio
             if artist_info['bio']:
-                email_patterns = [
-                    r'[\w\.-]+@[\w\.-]+\.\w+',
-                    r'contact[:\s]*[\w\.-]+@[\w\.-]+\.\w+',
-                    r'email[:\s]*[\w\.-]+@[\w\.-]+\.\w+',
-                    r'business[:\s]*[\w\.-]+@[\w\.-]+\.\w+'
-                ]
-                for pattern in email_patterns:
-                    email_match = re.search(pattern, artist_info['bio'], re.IGNORECASE)
-                    if email_match:
-                        artist_info['email'] = email_match.group(0)
-                        print(f"Found email: {artist_info['email']}")
-                        break
+                self._extract_email_from_bio(artist_info)
             
             # Enhanced social media link extraction
             social_selectors = [
@@ -203,6 +191,33 @@ class ArtistInfoExtractor:
                 pass
         return href
     
+    def _extract_email_from_bio(self, artist_info: Dict):
+        """Extract a contact email address from bio text."""
+        email_patterns = [
+            r'[\w\.-]+@[\w\.-]+\.\w+',
+            r'contact[:\s]*[\w\.-]+@[\w\.-]+\.\w+',
+            r'email[:\s]*[\w\.-]+@[\w\.-]+\.\w+',
+            r'business[:\s]*[\w\.-]+@[\w\.-]+\.\w+'
+        ]
+        for pattern in email_patterns:
+            email_match = re.search(pattern, artist_info['bio'], re.IGNORECASE)
+            if email_match:
+                artist_info['email'] = email_match.group(0)
+                print(f"Found email: {artist_info['email']}")
+                break
+    
+    def extract_fields_from_text(self, artist_info: Dict, page_source: str = None):
+        """Fill email and social fields from an already-fetched bio and page source.
+
+        Used when a profile was fetched without the browser (see LeadRefresher).
+        """
+        if artist_info.get('bio'):
+            if not artist_info.get('email'):
+                self._extract_email_from_bio(artist_info)
+            self._extract_social_from_bio(artist_info)
+        if page_source and not artist_info.get('instagram'):
+            self._extract_instagram_from_page_source(artist_info, page_source)
+    
     def _extract_social_from_bio(self, artist_info: Dict):
         """Extract social media links from bio text with enhanced patterns."""
         bio = artist_info['bio'].lower()
@@ -249,10 +264,11 @@ class ArtistInfoExtractor:
                         print(f"Extracted Twitter from bio: {artist_info['twitter']}")
                         break
     
-    def _extract_instagram_from_page_source(self, artist_info: Dict):
+    def _extract_instagram_from_page_source(self, artist_info: Dict, page_source: str = None):
         """Enhanced Instagram extraction from page source."""
         try:
-            page_source = self.driver.page_source
+            if page_source is None:
+                page_source = self.driver.page_source
             
             # Multiple Instagram patterns in page source
             instagram_patterns = [
@@ -3,6 +3,7 @@ from typing import List, Dict
 from driver_manager import DriverManager
 from youtube_scraper import YouTubeScraper
 from soundcloud_scraper import SoundCloudScraper
+from scrape_scheduler import ScrapeScheduler, Deadline
 
 class ArtistLeadScraper:
     def __init__(self):
@@ -11,13 +12,17 @@ class ArtistLeadScraper:
         self.youtube_scraper = YouTubeScraper()
         self.soundcloud_scraper = SoundCloudScraper(self.driver)
         
-    def search_youtube_producers(self, search_term: str, num_results: int = 3) -> List[str]:
+    def search_youtube_producers(self, search_term: str, num_results: int = 3, deadline: Deadline = None) -> List[str]:
         """Search YouTube for beat producers and extract their names from channel names."""
-        return self.youtube_scraper.search_youtube_producers(search_term, num_results)
+        timeout = 10 if deadline is None else max(1.0, min(10, deadline.remaining()))
+        return self.youtube_scraper.search_youtube_producers(search_term, num_results, timeout=timeout)
     
-    def search_soundcloud_artists(self, producer_name: str) -> List[Dict]:
+    def search_soundcloud_artists(self, producer_name: str, scheduler: ScrapeScheduler = None,
+                                  search_deadline: Deadline = None, profile_deadline: Deadline = None) -> List[Dict]:
         """Search SoundCloud for artists using beats from the producer."""
-        return self.soundcloud_scraper.search_soundcloud_artists(producer_name)
+        return self.soundcloud_scraper.search_soundcloud_artists(
+            producer_name, scheduler, search_deadline, profile_deadline
+        )
     
     def close(self):
         """Close the WebDriver."""
@@ -1,19 +1,43 @@
-
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 import os
 import stat
 import glob
+import threading
+import startup_report
+
+# Resolved chromedriver path is cached here so later local boots skip probing and downloads.
+# On Railway the driver path is fixed, so this cache is not used there.
+DRIVER_PATH_CACHE = os.environ.get(
+    "DRIVER_PATH_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "outreach-agent", "chromedriver-path")
+)
+
+# Browser started ahead of the first request by DriverManager.prewarm()
+_warm_driver = None
+_warm_lock = threading.Lock()
+_prewarm_idle = threading.Event()  # Cleared while a pre-warm is starting Chrome
+_prewarm_idle.set()
+
+# Longest a request waits for an in-progress pre-warm before starting its own browser
+PREWARM_WAIT_SECONDS = float(os.environ.get("PREWARM_WAIT_SECONDS", 60))
 
 class DriverManager:
-    def __init__(self):
+    def __init__(self, use_warm_driver: bool = True):
+        # Background callers (lead refresher, workers) pass use_warm_driver=False,
+        # leaving the pre-warmed browser for the first /scrape
         self.driver = None
-        self.setup_driver()
+        if use_warm_driver:
+            # Don't start a second Chrome alongside one that is still warming up
+            _prewarm_idle.wait(PREWARM_WAIT_SECONDS)
+            self.driver = self._take_warm_driver()
+        if self.driver is None:
+            self.setup_driver()
     
     def setup_driver(self):
         """Set up the Chrome WebDriver with appropriate options."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        
         chrome_options = Options()
         
         # Railway/Production optimizations
@@ -30,78 +54,160 @@ class DriverManager:
                 # Railway provides Chrome binary
                 chrome_options.binary_location = "/usr/bin/google-chrome"
                 service = Service("/usr/bin/chromedriver")
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
             else:
                 # Local development - try different approaches
                 print("Setting up ChromeDriver for local development...")
-                
-                # Try homebrew installation first
-                homebrew_paths = [
-                    "/opt/homebrew/bin/chromedriver",  # M1 Mac
-                    "/usr/local/bin/chromedriver"      # Intel Mac
-                ]
-                
-                driver_path = None
-                for path in homebrew_paths:
-                    if os.path.exists(path) and os.access(path, os.X_OK):
-                        driver_path = path
-                        print(f"Found Homebrew ChromeDriver at: {driver_path}")
-                        break
-                
-                if not driver_path:
-                    # Try webdriver-manager but fix the path issue
-                    try:
-                        downloaded_path = ChromeDriverManager().install()
-                        print(f"Downloaded ChromeDriver to: {downloaded_path}")
-                        
-                        # Fix the common THIRD_PARTY_NOTICES issue
-                        if downloaded_path.endswith('THIRD_PARTY_NOTICES.chromedriver'):
-                            # Look for the actual chromedriver in the same directory
-                            dir_path = os.path.dirname(downloaded_path)
-                            print(f"Looking for actual chromedriver in: {dir_path}")
-                            
-                            # Try different possible names
-                            possible_names = ['chromedriver', 'chromedriver-mac-arm64', 'chromedriver-mac-x64']
-                            for name in possible_names:
-                                actual_driver = os.path.join(dir_path, name)
-                                if os.path.exists(actual_driver) and not actual_driver.endswith('THIRD_PARTY_NOTICES.chromedriver'):
-                                    driver_path = actual_driver
-                                    print(f"Found actual ChromeDriver at: {driver_path}")
-                                    break
-                            
-                            # If not found, try glob pattern search
-                            if not driver_path:
-                                pattern = os.path.join(dir_path, "*chromedriver*")
-                                matches = glob.glob(pattern)
-                                for match in matches:
-                                    if not match.endswith('THIRD_PARTY_NOTICES.chromedriver') and os.access(match, os.X_OK):
-                                        driver_path = match
-                                        print(f"Found ChromeDriver via glob: {driver_path}")
-                                        break
-                        else:
-                            driver_path = downloaded_path
-                        
-                        # Make sure it's executable
-                        if driver_path and os.path.exists(driver_path):
-                            os.chmod(driver_path, stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
-                            print(f"Made ChromeDriver executable: {driver_path}")
-                        
-                    except Exception as e:
-                        print(f"WebDriver manager failed: {str(e)}")
-                        driver_path = None
-                
-                if not driver_path:
-                    raise Exception("No valid chromedriver found. Please install ChromeDriver using 'brew install chromedriver' or manually download it")
-                
-                service = Service(driver_path)
+                driver_path, from_cache = self.resolve_driver_path()
                 print(f"Using ChromeDriver at: {driver_path}")
                 
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                try:
+                    self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+                except Exception:
+                    if not from_cache:
+                        raise
+                    # Cached driver may no longer match the installed Chrome; probe again
+                    print("Cached ChromeDriver failed to start, resolving it again...")
+                    self.clear_cached_driver_path()
+                    driver_path, _ = self.resolve_driver_path()
+                    self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+                
             print("Chrome WebDriver initialized successfully")
             
         except Exception as e:
             print(f"Error setting up Chrome WebDriver: {str(e)}")
             raise Exception(f"Could not initialize Chrome WebDriver: {str(e)}")
     
+    @classmethod
+    def resolve_driver_path(cls):
+        """Return (chromedriver path, whether it came from the on-disk cache)."""
+        try:
+            with open(DRIVER_PATH_CACHE) as f:
+                cached_path = f.read().strip()
+            if cached_path and os.path.exists(cached_path) and os.access(cached_path, os.X_OK):
+                print(f"Using cached ChromeDriver path: {cached_path}")
+                return cached_path, True
+        except OSError:
+            pass
+        
+        driver_path = cls._probe_driver_path()
+        try:
+            os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+            with open(DRIVER_PATH_CACHE, 'w') as f:
+                f.write(driver_path)
+        except OSError as e:
+            print(f"Could not cache ChromeDriver path: {str(e)}")
+        startup_report.mark("driver path resolved")
+        return driver_path, False
+    
+    @staticmethod
+    def clear_cached_driver_path():
+        try:
+            os.remove(DRIVER_PATH_CACHE)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _probe_driver_path() -> str:
+        """Find a chromedriver binary: Homebrew installs first, then webdriver-manager."""
+        # Try homebrew installation first
+        homebrew_paths = [
+            "/opt/homebrew/bin/chromedriver",  # M1 Mac
+            "/usr/local/bin/chromedriver"      # Intel Mac
+        ]
+        
+        driver_path = None
+        for path in homebrew_paths:
+            if os.path.exists(path) and os.access(path, os.X_OK):
+                driver_path = path
+                print(f"Found Homebrew ChromeDriver at: {driver_path}")
+                break
+        
+        if not driver_path:
+            # Try webdriver-manager but fix the path issue
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                downloaded_path = ChromeDriverManager().install()
+                print(f"Downloaded ChromeDriver to: {downloaded_path}")
+                
+                # Fix the common THIRD_PARTY_NOTICES issue
+                if downloaded_path.endswith('THIRD_PARTY_NOTICES.chromedriver'):
+                    # Look for the actual chromedriver in the same directory
+                    dir_path = os.path.dirname(downloaded_path)
+                    print(f"Looking for actual chromedriver in: {dir_path}")
+                    
+                    # Try different possible names
+                    possible_names = ['chromedriver', 'chromedriver-mac-arm64', 'chromedriver-mac-x64']
+                    for name in possible_names:
+                        actual_driver = os.path.join(dir_path, name)
+                        if os.path.exists(actual_driver) and not actual_driver.endswith('THIRD_PARTY_NOTICES.chromedriver'):
+                            driver_path = actual_driver
+                            print(f"Found actual ChromeDriver at: {driver_path}")
+                            break
+                    
+                    # If not found, try glob pattern search
+                    if not driver_path:
+                        pattern = os.path.join(dir_path, "*chromedriver*")
+                        matches = glob.glob(pattern)
+                        for match in matches:
+                            if not match.endswith('THIRD_PARTY_NOTICES.chromedriver') and os.access(match, os.X_OK):
+                                driver_path = match
+                                print(f"Found ChromeDriver via glob: {driver_path}")
+                                break
+                else:
+                    driver_path = downloaded_path
+                
+                # Make sure it's executable
+                if driver_path and os.path.exists(driver_path):
+                    os.chmod(driver_path, stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
+                    print(f"Made ChromeDriver executable: {driver_path}")
+                
+            except Exception as e:
+                print(f"WebDriver manager failed: {str(e)}")
+                driver_path = None
+        
+        if not driver_path:
+            raise Exception("No valid chromedriver found. Please install ChromeDriver using 'brew install chromedriver' or manually download it")
+        
+        return driver_path
+    
+    @classmethod
+    def prewarm(cls):
+        """Start a browser now so the first scrape doesn't pay for Chrome's startup."""
+        global _warm_driver
+        with _warm_lock:
+            if _warm_driver is not None or not _prewarm_idle.is_set():
+                return
+            _prewarm_idle.clear()
+        try:
+            driver = cls(use_warm_driver=False).driver
+            with _warm_lock:
+                _warm_driver = driver
+            startup_report.mark("browser prewarmed")
+        except Exception as e:
+            print(f"Browser pre-warm failed: {str(e)}")
+        finally:
+            _prewarm_idle.set()
+    
+    @staticmethod
+    def _take_warm_driver():
+        global _warm_driver
+        with _warm_lock:
+            driver, _warm_driver = _warm_driver, None
+        if driver is not None:
+            print("Using pre-warmed Chrome WebDriver")
+        return driver
+    
+    def is_alive(self) -> bool:
+        """Whether the browser session still responds (it can crash or be killed mid-scrape)."""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_window_handle
+            return True
+        except Exception:
+            return False
+    
     def get_driver(self):
         """Get the WebDriver instance."""
         return self.driver
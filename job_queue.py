@@ -0,0 +1,524 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lead_filters import has_instagram
+
+DEFAULT_QUEUE_PATH = os.environ.get("JOB_QUEUE_PATH", "jobs.db")
+DEFAULT_QUEUE_URL = os.environ.get("JOB_QUEUE_DATABASE_URL") or os.environ.get("DATABASE_URL")
+
+# Postgres when a database is configured (e.g. a Railway Postgres plugin), else a local SQLite file
+JOB_QUEUE_BACKEND = os.environ.get("JOB_QUEUE_BACKEND", "postgres" if DEFAULT_QUEUE_URL else "sqlite")
+
+# Task kinds, in the order a scrape job fans out
+SCRAPE_JOB = 'scrape_job'            # payload: {search_term} -> producer_crawl per producer
+PRODUCER_CRAWL = 'producer_crawl'    # payload: {producer} -> profile_scrape per artist URL
+PROFILE_SCRAPE = 'profile_scrape'    # payload: {url, template} -> result: artist info
+
+
+class JobQueue(ABC):
+    """Durable task queue shared by the API and any number of workers.
+
+    Tasks are leased with a visibility timeout: a leased task that is not
+    completed (or extended) before its lease expires becomes visible again and
+    is handed to another worker, up to `max_attempts` times. Completing a task
+    and enqueuing the sub-tasks it produced must be atomic, so a job is
+    finished exactly when it has no pending or leased tasks left.
+
+    Backends are picked with JOB_QUEUE_BACKEND (see `get_job_queue`).
+    """
+
+    visibility_timeout: float
+
+    @abstractmethod
+    def create_job(self, search_term: str) -> str:
+        """Create a scrape job and enqueue its root task. Returns the job id."""
+
+    @abstractmethod
+    def lease(self, worker_id: str, kinds: Iterable[str] = None) -> Optional[Dict]:
+        """Lease the oldest available task, or return None if there is nothing to do."""
+
+    @abstractmethod
+    def extend_lease(self, task: Dict, worker_id: str) -> bool:
+        """Push a held lease's expiry a full visibility timeout ahead. False if the lease was lost."""
+
+    @abstractmethod
+    def complete(self, task: Dict, worker_id: str, result: Dict = None,
+                 children: Iterable[Tuple[str, Dict, Optional[str]]] = ()) -> bool:
+        """Mark a leased task done and enqueue its sub-tasks. False if the lease was lost."""
+
+    @abstractmethod
+    def fail(self, task: Dict, worker_id: str, error: str) -> bool:
+        """Record a failed attempt for retry. False if the lease was lost."""
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Job status, per-status task counts and the qualified leads scraped so far."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """JobQueue backed by a local SQLite file.
+
+    Safe for any number of processes on one machine, or on one local disk.
+    SQLite's locking is not reliable on network file systems and Railway
+    replicas don't share a disk, so this backend is for local development;
+    use PostgresJobQueue to spread workers across machines.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH,
+                 visibility_timeout: float = float(os.environ.get("JOB_VISIBILITY_TIMEOUT", 300)),
+                 max_attempts: int = int(os.environ.get("JOB_MAX_ATTEMPTS", 3)),
+                 retry_delay: float = 5.0):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._init_schema()
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in a write transaction that excludes other processes."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    search_term TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    lease_expires_at REAL,
+                    worker_id TEXT,
+                    result TEXT,
+                    error TEXT,
+                    UNIQUE (job_id, dedupe_key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, available_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_job ON tasks (job_id, status)")
+        # WAL lets the API read job results while workers write
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.close()
+
+    def create_job(self, search_term: str) -> str:
+        """Create a scrape job and enqueue its root task. Returns the job id."""
+        job_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, search_term, status, created_at) VALUES (?, ?, 'queued', ?)",
+                (job_id, search_term, time.time())
+            )
+            self._enqueue(conn, job_id, SCRAPE_JOB, {'search_term': search_term})
+        return job_id
+
+    def _enqueue(self, conn, job_id: str, kind: str, payload: Dict, dedupe_key: str = None):
+        # Tasks with the same dedupe key in one job (e.g. an artist found via two producers) run once
+        conn.execute(
+            "INSERT OR IGNORE INTO tasks (job_id, kind, payload, dedupe_key, available_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), dedupe_key, time.time())
+        )
+
+    def lease(self, worker_id: str, kinds: Iterable[str] = None) -> Optional[Dict]:
+        """Lease the oldest available task, or return None if there is nothing to do.
+
+        Tasks whose lease has expired are available again; ones that have used
+        up their attempts are marked failed instead of being handed out.
+        """
+        now = time.time()
+        kind_filter = ''
+        params: List = [now, now]
+        if kinds:
+            kinds = list(kinds)
+            kind_filter = f"AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(f"""
+                    SELECT * FROM tasks
+                    WHERE ((status = 'pending' AND available_at <= ?)
+                        OR (status = 'leased' AND lease_expires_at <= ?))
+                    {kind_filter}
+                    ORDER BY id
+                    LIMIT 1
+                """, params).fetchone()
+                if row is None:
+                    return None
+
+                if row['attempts'] >= self.max_attempts:
+                    self._finish_task(conn, row, 'failed', error=row['error'] or 'lease expired too many times')
+                    continue
+
+                conn.execute("""
+                    UPDATE tasks SET status = 'leased', attempts = attempts + 1,
+                        lease_expires_at = ?, worker_id = ?
+                    WHERE id = ?
+                """, (now + self.visibility_timeout, worker_id, row['id']))
+                conn.execute("UPDATE jobs SET status = 'running' WHERE id = ? AND status = 'queued'", (row['job_id'],))
+
+                task = dict(row)
+                task['payload'] = json.loads(row['payload'])
+                task['attempts'] += 1
+                return task
+
+    def complete(self, task: Dict, worker_id: str, result: Dict = None,
+                 children: Iterable[Tuple[str, Dict, Optional[str]]] = ()) -> bool:
+        """Mark a leased task done and enqueue the (kind, payload, dedupe_key) sub-tasks it produced.
+
+        Returns False if the lease was lost (it expired and the task was handed
+        to another worker), in which case nothing is written.
+        """
+        with self._transaction() as conn:
+            row = self._owned_task(conn, task['id'], worker_id)
+            if row is None:
+                return False
+            for kind, payload, dedupe_key in children:
+                self._enqueue(conn, row['job_id'], kind, payload, dedupe_key)
+            self._finish_task(conn, row, 'done', result=result)
+            return True
+
+    def extend_lease(self, task: Dict, worker_id: str) -> bool:
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET lease_expires_at = ? WHERE id = ? AND status = 'leased' AND worker_id = ?",
+                (time.time() + self.visibility_timeout, task['id'], worker_id)
+            ).rowcount
+        return updated == 1
+
+    def fail(self, task: Dict, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; the task is retried after a delay until it runs out of attempts."""
+        with self._transaction() as conn:
+            row = self._owned_task(conn, task['id'], worker_id)
+            if row is None:
+                return False
+            if row['attempts'] < self.max_attempts:
+                conn.execute("""
+                    UPDATE tasks SET status = 'pending', lease_expires_at = NULL, worker_id = NULL,
+                        available_at = ?, error = ?
+                    WHERE id = ?
+                """, (time.time() + self.retry_delay * row['attempts'], error, row['id']))
+            else:
+                self._finish_task(conn, row, 'failed', error=error)
+            return True
+
+    def _owned_task(self, conn, task_id: int, worker_id: str):
+        return conn.execute(
+            "SELECT * FROM tasks WHERE id = ? AND status = 'leased' AND worker_id = ?",
+            (task_id, worker_id)
+        ).fetchone()
+
+    def _finish_task(self, conn, row, status: str, result: Dict = None, error: str = None):
+        conn.execute(
+            "UPDATE tasks SET status = ?, result = ?, error = ?, lease_expires_at = NULL WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, row['id'])
+        )
+        open_tasks = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status IN ('pending', 'leased')",
+            (row['job_id'],)
+        ).fetchone()[0]
+        if open_tasks == 0:
+            root_failed = conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND kind = ? AND status = 'failed'",
+                (row['job_id'], SCRAPE_JOB)
+            ).fetchone()[0]
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+                ('failed' if root_failed else 'done', time.time(), row['job_id'])
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Job status, per-status task counts and the qualified leads scraped so far."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+
+            counts = {
+                row['status']: row['n'] for row in conn.execute(
+                    "SELECT status, COUNT(*) AS n FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)
+                )
+            }
+            leads = []
+            for row in conn.execute(
+                "SELECT result FROM tasks WHERE job_id = ? AND kind = ? AND status = 'done' AND result IS NOT NULL ORDER BY id",
+                (job_id, PROFILE_SCRAPE)
+            ):
+                artist = json.loads(row['result'])
+                if has_instagram(artist):
+                    leads.append(artist)
+
+            return {**dict(job), 'tasks': counts, 'leads': leads}
+        finally:
+            conn.close()
+
+
+class PostgresJobQueue(JobQueue):
+    """JobQueue backed by Postgres, shared by the API and workers on any number of machines.
+
+    Connects to JOB_QUEUE_DATABASE_URL (or DATABASE_URL). Leases use
+    SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never hand out
+    the same task, and finishing a task locks its job row so exactly one
+    worker sees the job's last open task close.
+    """
+
+    def __init__(self, dsn: str = DEFAULT_QUEUE_URL,
+                 visibility_timeout: float = float(os.environ.get("JOB_VISIBILITY_TIMEOUT", 300)),
+                 max_attempts: int = int(os.environ.get("JOB_MAX_ATTEMPTS", 3)),
+                 retry_delay: float = 5.0):
+        try:
+            import psycopg2
+            import psycopg2.extras
+        except ImportError:
+            raise RuntimeError("The postgres job queue requires psycopg2 (pip install psycopg2-binary)")
+        if not dsn:
+            raise RuntimeError("The postgres job queue needs JOB_QUEUE_DATABASE_URL or DATABASE_URL")
+        self._psycopg2 = psycopg2
+        self.dsn = dsn
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._init_schema()
+
+    @contextmanager
+    def _transaction(self):
+        """Yield a cursor whose statements commit together (or roll back on error)."""
+        conn = self._psycopg2.connect(self.dsn)
+        try:
+            with conn:
+                with conn.cursor(cursor_factory=self._psycopg2.extras.RealDictCursor) as cur:
+                    yield cur
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._transaction() as cur:
+            # Replicas booting together would otherwise race to create the same tables
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext('job_queue_schema'))")
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    search_term TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at DOUBLE PRECISION NOT NULL,
+                    finished_at DOUBLE PRECISION
+                )
+            """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id BIGSERIAL PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at DOUBLE PRECISION NOT NULL,
+                    lease_expires_at DOUBLE PRECISION,
+                    worker_id TEXT,
+                    result TEXT,
+                    error TEXT,
+                    UNIQUE (job_id, dedupe_key)
+                )
+            """)
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, available_at)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_tasks_job ON tasks (job_id, status)")
+
+    def create_job(self, search_term: str) -> str:
+        """Create a scrape job and enqueue its root task. Returns the job id."""
+        job_id = uuid.uuid4().hex
+        with self._transaction() as cur:
+            cur.execute(
+                "INSERT INTO jobs (id, search_term, status, created_at) VALUES (%s, %s, 'queued', %s)",
+                (job_id, search_term, time.time())
+            )
+            self._enqueue(cur, job_id, SCRAPE_JOB, {'search_term': search_term})
+        return job_id
+
+    def _enqueue(self, cur, job_id: str, kind: str, payload: Dict, dedupe_key: str = None):
+        # Tasks with the same dedupe key in one job (e.g. an artist found via two producers) run once
+        cur.execute(
+            "INSERT INTO tasks (job_id, kind, payload, dedupe_key, available_at) VALUES (%s, %s, %s, %s, %s) "
+            "ON CONFLICT (job_id, dedupe_key) DO NOTHING",
+            (job_id, kind, json.dumps(payload), dedupe_key, time.time())
+        )
+
+    def lease(self, worker_id: str, kinds: Iterable[str] = None) -> Optional[Dict]:
+        """Lease the oldest available task, or return None if there is nothing to do.
+
+        Tasks another worker is leasing right now are skipped rather than waited on.
+        """
+        now = time.time()
+        kind_filter = ''
+        params: List = [now, now]
+        if kinds:
+            kind_filter = 'AND kind = ANY(%s)'
+            params.append(list(kinds))
+
+        with self._transaction() as cur:
+            while True:
+                cur.execute(f"""
+                    SELECT * FROM tasks
+                    WHERE ((status = 'pending' AND available_at <= %s)
+                        OR (status = 'leased' AND lease_expires_at <= %s))
+                    {kind_filter}
+                    ORDER BY id
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                """, params)
+                row = cur.fetchone()
+                if row is None:
+                    return None
+
+                if row['attempts'] >= self.max_attempts:
+                    self._finish_task(cur, row, 'failed', error=row['error'] or 'lease expired too many times')
+                    continue
+
+                cur.execute("""
+                    UPDATE tasks SET status = 'leased', attempts = attempts + 1,
+                        lease_expires_at = %s, worker_id = %s
+                    WHERE id = %s
+                """, (now + self.visibility_timeout, worker_id, row['id']))
+                cur.execute("UPDATE jobs SET status = 'running' WHERE id = %s AND status = 'queued'", (row['job_id'],))
+
+                task = dict(row)
+                task['payload'] = json.loads(row['payload'])
+                task['attempts'] += 1
+                return task
+
+    def complete(self, task: Dict, worker_id: str, result: Dict = None,
+                 children: Iterable[Tuple[str, Dict, Optional[str]]] = ()) -> bool:
+        """Mark a leased task done and enqueue the (kind, payload, dedupe_key) sub-tasks it produced."""
+        with self._transaction() as cur:
+            row = self._owned_task(cur, task['id'], worker_id)
+            if row is None:
+                return False
+            for kind, payload, dedupe_key in children:
+                self._enqueue(cur, row['job_id'], kind, payload, dedupe_key)
+            self._finish_task(cur, row, 'done', result=result)
+            return True
+
+    def extend_lease(self, task: Dict, worker_id: str) -> bool:
+        with self._transaction() as cur:
+            cur.execute(
+                "UPDATE tasks SET lease_expires_at = %s WHERE id = %s AND status = 'leased' AND worker_id = %s",
+                (time.time() + self.visibility_timeout, task['id'], worker_id)
+            )
+            return cur.rowcount == 1
+
+    def fail(self, task: Dict, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; the task is retried after a delay until it runs out of attempts."""
+        with self._transaction() as cur:
+            row = self._owned_task(cur, task['id'], worker_id)
+            if row is None:
+                return False
+            if row['attempts'] < self.max_attempts:
+                cur.execute("""
+                    UPDATE tasks SET status = 'pending', lease_expires_at = NULL, worker_id = NULL,
+                        available_at = %s, error = %s
+                    WHERE id = %s
+                """, (time.time() + self.retry_delay * row['attempts'], error, row['id']))
+            else:
+                self._finish_task(cur, row, 'failed', error=error)
+            return True
+
+    def _owned_task(self, cur, task_id: int, worker_id: str):
+        cur.execute(
+            "SELECT * FROM tasks WHERE id = %s AND status = 'leased' AND worker_id = %s FOR UPDATE",
+            (task_id, worker_id)
+        )
+        return cur.fetchone()
+
+    def _finish_task(self, cur, row, status: str, result: Dict = None, error: str = None):
+        # Serialise finishers per job, so the count below sees every other committed finish
+        cur.execute("SELECT id FROM jobs WHERE id = %s FOR UPDATE", (row['job_id'],))
+        cur.execute(
+            "UPDATE tasks SET status = %s, result = %s, error = %s, lease_expires_at = NULL WHERE id = %s",
+            (status, json.dumps(result) if result is not None else None, error, row['id'])
+        )
+        cur.execute(
+            "SELECT COUNT(*) AS n FROM tasks WHERE job_id = %s AND status IN ('pending', 'leased')",
+            (row['job_id'],)
+        )
+        if cur.fetchone()['n'] == 0:
+            cur.execute(
+                "SELECT COUNT(*) AS n FROM tasks WHERE job_id = %s AND kind = %s AND status = 'failed'",
+                (row['job_id'], SCRAPE_JOB)
+            )
+            root_failed = cur.fetchone()['n']
+            cur.execute(
+                "UPDATE jobs SET status = %s, finished_at = %s WHERE id = %s",
+                ('failed' if root_failed else 'done', time.time(), row['job_id'])
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Job status, per-status task counts and the qualified leads scraped so far."""
+        with self._transaction() as cur:
+            cur.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
+            job = cur.fetchone()
+            if job is None:
+                return None
+
+            cur.execute("SELECT status, COUNT(*) AS n FROM tasks WHERE job_id = %s GROUP BY status", (job_id,))
+            counts = {row['status']: row['n'] for row in cur.fetchall()}
+            cur.execute(
+                "SELECT result FROM tasks WHERE job_id = %s AND kind = %s AND status = 'done' AND result IS NOT NULL ORDER BY id",
+                (job_id, PROFILE_SCRAPE)
+            )
+            leads = [artist for artist in (json.loads(row['result']) for row in cur.fetchall()) if has_instagram(artist)]
+
+            return {**dict(job), 'tasks': counts, 'leads': leads}
+
+
+# JOB_QUEUE_BACKEND value -> JobQueue implementation
+QUEUE_BACKENDS = {
+    'sqlite': SQLiteJobQueue,
+    'postgres': PostgresJobQueue,
+}
+
+_shared_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    """Process-wide JobQueue instance for the backend named by JOB_QUEUE_BACKEND."""
+    global _shared_queue
+    if _shared_queue is None:
+        backend = QUEUE_BACKENDS.get(JOB_QUEUE_BACKEND)
+        if backend is None:
+            raise ValueError(
+                f"Unknown JOB_QUEUE_BACKEND '{JOB_QUEUE_BACKEND}' (expected one of: {', '.join(QUEUE_BACKENDS)})"
+            )
+        _shared_queue = backend()
+    return _shared_queue
@@ -0,0 +1,163 @@
+import argparse
+import csv
+import io
+import json
+import sys
+import zlib
+from typing import Iterable, Iterator, List, Optional
+
+from lead_store import LeadStore, LEAD_COLUMNS, get_lead_store
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def export_leads(fmt: str, fields: Optional[List[str]] = None, require_instagram: bool = False,
+                 require_email: bool = False, gzip: bool = False, chunk_size: int = 5000,
+                 store: LeadStore = None) -> Iterator[bytes]:
+    """Stream stored leads as CSV, JSONL or Parquet bytes.
+
+    Leads are read and encoded `chunk_size` at a time, so memory use does not
+    grow with the number of leads. Raises ValueError for an unknown format or
+    field, and RuntimeError if Parquet is requested without pyarrow installed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of: {', '.join(EXPORT_FORMATS)})")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    fields = list(fields or LEAD_COLUMNS)
+    unknown = [field for field in fields if field not in LEAD_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown lead fields: {', '.join(unknown)}")
+
+    if fmt == 'parquet':
+        _import_pyarrow()  # Fail before streaming starts rather than midway
+
+    store = store or get_lead_store()
+    batches = store.iter_leads(fields, require_instagram, require_email, batch_size=chunk_size)
+
+    if fmt == 'csv':
+        chunks = _csv_chunks(batches, fields)
+    elif fmt == 'jsonl':
+        chunks = _jsonl_chunks(batches)
+    else:
+        chunks = _parquet_chunks(batches, fields)
+
+    return _gzip_chunks(chunks) if gzip else chunks
+
+
+def _csv_chunks(batches: Iterable[List[dict]], fields: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def _jsonl_chunks(batches: Iterable[List[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield ''.join(json.dumps(lead, ensure_ascii=False) + '\n' for lead in batch).encode('utf-8')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the generator driving it."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+    return pa, pq
+
+
+def _parquet_chunks(batches: Iterable[List[dict]], fields: List[str]) -> Iterator[bytes]:
+    pa, pq = _import_pyarrow()
+    schema = pa.schema([(field, pa.string()) for field in fields])
+    sink = _ChunkSink()
+    # Each batch becomes one row group, flushed to the caller as soon as it is written
+    with pq.ParquetWriter(sink, schema, compression='snappy') as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_filename(fmt: str, gzip: bool) -> str:
+    return f"leads.{fmt}{'.gz' if gzip else ''}"
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Export stored artist leads")
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='csv')
+    parser.add_argument('--fields', help=f"Comma-separated fields (default: {','.join(LEAD_COLUMNS)})")
+    parser.add_argument('--require-instagram', action='store_true', help="Only leads with an Instagram link")
+    parser.add_argument('--require-email', action='store_true', help="Only leads with an email address")
+    parser.add_argument('--gzip', action='store_true', help="Gzip-compress the output")
+    parser.add_argument('--chunk-size', type=_positive_int, default=5000, help="Leads per chunk (at least 1)")
+    parser.add_argument('--db', help="Lead database path (default: LEADS_DB_PATH or leads.db)")
+    parser.add_argument('--out', help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    fields = [field.strip() for field in args.fields.split(',')] if args.fields else None
+    try:
+        chunks = export_leads(
+            args.format, fields, args.require_instagram, args.require_email, args.gzip,
+            args.chunk_size, LeadStore(args.db) if args.db else None
+        )
+        out = open(args.out, 'wb') if args.out else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if args.out:
+                out.close()
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
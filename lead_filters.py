@@ -0,0 +1,10 @@
+from typing import Dict, Optional
+
+
+def has_instagram(artist: Optional[Dict]) -> bool:
+    """Whether an artist record has a usable Instagram link (our definition of a qualified lead)."""
+    return bool(artist and
+                artist.get('instagram') and
+                isinstance(artist['instagram'], str) and
+                artist['instagram'].strip() != '' and
+                'instagram.com' in artist['instagram'].lower())
@@ -0,0 +1,161 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+from artist_info_extractor import ArtistInfoExtractor
+from lead_store import LeadStore, LEAD_FIELDS, LINK_FIELDS, field_changed, get_lead_store
+
+HYDRATION_PATTERN = re.compile(r'window\.__sc_hydration\s*=\s*(\[.*?\]);\s*</script>', re.DOTALL)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class LeadRefresher:
+    """Background thread that keeps known leads fresh without re-crawling.
+
+    Every `interval` seconds it takes the highest-priority batch of stale leads
+    from the LeadStore (see `LeadStore.due_for_refresh`), re-fetches each
+    profile and writes back only the fields that changed. Profiles are fetched
+    with a plain HTTP request and parsed from SoundCloud's hydration data; the
+    browser is started for profiles that path can't read. Links the HTTP path
+    guesses from bio text are low-confidence and only fill empty fields, so
+    links are re-read from the rendered profile in the browser every
+    `link_check_every` checks of a lead, and whenever its bio changed.
+    Profiles that can't be fetched at all are recorded as failed checks and
+    back off.
+    """
+
+    def __init__(self, store: LeadStore = None,
+                 interval: float = float(os.environ.get("LEAD_REFRESH_INTERVAL", 300)),
+                 batch_size: int = int(os.environ.get("LEAD_REFRESH_BATCH_SIZE", 20)),
+                 min_age: float = float(os.environ.get("LEAD_REFRESH_MIN_AGE", 24 * 3600)),
+                 link_check_every: int = int(os.environ.get("LEAD_REFRESH_LINK_CHECK_EVERY", 4))):
+        self.store = store or get_lead_store()
+        self.interval = interval
+        self.batch_size = batch_size
+        self.min_age = min_age
+        self.link_check_every = max(1, link_check_every)
+        self.extractor = ArtistInfoExtractor(None)
+        self._stop = threading.Event()
+        self._thread = None
+        self._driver_manager = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lead-refresher", daemon=True)
+        self._thread.start()
+        print(f"🔄 Lead refresher started (every {self.interval}s, batch of {self.batch_size})")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_once()
+            except Exception as e:
+                print(f"❌ Lead refresh batch failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def refresh_once(self) -> int:
+        """Refresh one batch of due leads. Returns the number of leads that changed."""
+        leads = self.store.due_for_refresh(self.batch_size, self.min_age)
+        if not leads:
+            return 0
+
+        print(f"🔄 Refreshing {len(leads)} leads...")
+        changed = 0
+        try:
+            for lead in leads:
+                if self._stop.is_set():
+                    break
+                url = lead['url']
+                fields, low_confidence_fields = self.fetch_profile(lead)
+                if fields is None:
+                    print(f"   ❌ Could not fetch {url}; backing off")
+                    self.store.record_failed_check(url)
+                    continue
+                changes = self.store.apply_update(url, fields, 'refresh', low_confidence_fields)
+                if changes:
+                    changed += 1
+                    print(f"   ✏️ {url} changed: {', '.join(changes)}")
+        finally:
+            self._close_driver()
+
+        print(f"🔄 Refresh complete: {changed}/{len(leads)} leads changed")
+        return changed
+
+    def fetch_profile(self, lead: Dict) -> Tuple[Optional[Dict], Tuple[str, ...]]:
+        """Fetch a stored lead's profile, trying plain HTTP before the browser.
+
+        Returns (fields or None, fields that are only guesses and must not
+        overwrite stored values).
+        """
+        url = lead['url']
+        fields = self._fetch_via_http(url)
+        if fields is not None and not self._needs_link_check(lead, fields):
+            return fields, LINK_FIELDS
+
+        browser_fields = self._fetch_via_browser(url)
+        if browser_fields is not None:
+            return browser_fields, ()
+        return fields, LINK_FIELDS
+
+    def _needs_link_check(self, lead: Dict, fields: Dict) -> bool:
+        """Whether stored links are due to be re-read from the rendered profile."""
+        if (lead['check_count'] + 1) % self.link_check_every == 0:
+            return True
+        return bool(fields['bio']) and field_changed('bio', lead['bio'], fields['bio'])
+
+    def _fetch_via_http(self, url: str) -> Optional[Dict]:
+        import requests
+
+        try:
+            response = requests.get(url, headers=HEADERS, timeout=10)
+            if response.status_code != 200:
+                return None
+
+            match = HYDRATION_PATTERN.search(response.text)
+            if not match:
+                return None
+
+            user = next(
+                (entry.get('data') for entry in json.loads(match.group(1)) if entry.get('hydratable') == 'user'),
+                None
+            )
+            if not user or not user.get('username'):
+                return None
+
+            artist_info = {field: '' for field in LEAD_FIELDS}
+            artist_info['name'] = user.get('username', '').strip()
+            artist_info['bio'] = (user.get('description') or '').strip()
+            self.extractor.extract_fields_from_text(artist_info, response.text)
+            return artist_info
+
+        except Exception as e:
+            print(f"   ⚠️ HTTP refresh failed for {url}: {str(e)}")
+            return None
+
+    def _fetch_via_browser(self, url: str) -> Optional[Dict]:
+        try:
+            if self._driver_manager is None:
+                from driver_manager import DriverManager
+                self._driver_manager = DriverManager(use_warm_driver=False)
+            extractor = ArtistInfoExtractor(self._driver_manager.get_driver())
+            return extractor.scrape_artist_info(url)
+        except Exception as e:
+            print(f"   ⚠️ Browser refresh failed for {url}: {str(e)}")
+            return None
+
+    def _close_driver(self):
+        if self._driver_manager is not None:
+            self._driver_manager.close()
+            self._driver_manager = None
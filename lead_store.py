@@ -0,0 +1,270 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_DB_PATH = os.environ.get("LEADS_DB_PATH", "leads.db")
+
+# Extracted fields tracked per lead (matches the ArtistLead response model)
+LEAD_FIELDS = ('name', 'email', 'instagram', 'twitter', 'youtube', 'website', 'bio')
+LEAD_COLUMNS = ('url', *LEAD_FIELDS)
+
+# Link fields, compared ignoring scheme, "www.", case and trailing slashes
+LINK_FIELDS = ('instagram', 'twitter', 'youtube', 'website')
+
+# Free-text fields, compared ignoring whitespace (rendered page text vs. raw profile data)
+TEXT_FIELDS = ('name', 'bio')
+
+# Failed checks push a lead's next refresh back by min_age x 2^failures, capped here
+MAX_FAILURE_BACKOFF = 6
+
+# Largest page of the change log a single request may read
+MAX_CHANGES_LIMIT = 1000
+
+
+def field_changed(field: str, old: str, new: str) -> bool:
+    """Whether two values of `field` differ once fetch-path differences are ignored."""
+    return _comparable(field, old) != _comparable(field, new)
+
+
+def _comparable(field: str, value: str) -> str:
+    """Normalise a value so equivalent values from different fetch paths compare equal."""
+    if field in TEXT_FIELDS:
+        return ' '.join(value.split())
+    if field not in LINK_FIELDS:
+        return value
+    value = value.strip().lower()
+    for prefix in ('https://', 'http://'):
+        if value.startswith(prefix):
+            value = value[len(prefix):]
+    if value.startswith('www.'):
+        value = value[len('www.'):]
+    return value.rstrip('/')
+
+
+class LeadStore:
+    """SQLite-backed store of every artist profile we have scraped.
+
+    Besides the extracted fields, each lead keeps refresh bookkeeping
+    (when it was last checked/changed and how often it changes) and every
+    field change is appended to `lead_changes`.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that also excludes other processes (API, workers) sharing the file."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS leads (
+                    url TEXT PRIMARY KEY,
+                    {', '.join(f"{field} TEXT NOT NULL DEFAULT ''" for field in LEAD_FIELDS)},
+                    first_seen REAL NOT NULL,
+                    last_checked REAL NOT NULL,
+                    last_changed REAL,
+                    check_count INTEGER NOT NULL DEFAULT 0,
+                    change_count INTEGER NOT NULL DEFAULT 0,
+                    failure_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(leads)")}
+            if 'failure_count' not in columns:
+                conn.execute("ALTER TABLE leads ADD COLUMN failure_count INTEGER NOT NULL DEFAULT 0")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lead_changes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    old_value TEXT NOT NULL,
+                    new_value TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    changed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lead_changes_url ON lead_changes (url)")
+
+    def get_lead(self, url: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM leads WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def upsert_leads(self, artists: Iterable[Dict], source: str = 'scrape') -> int:
+        """Insert new leads and merge fresh data into known ones. Returns how many were new or changed."""
+        changed = 0
+        for artist in artists:
+            if artist and artist.get('url') and self.apply_update(artist['url'], artist, source):
+                changed += 1
+        return changed
+
+    def apply_update(self, url: str, fields: Dict, source: str,
+                     low_confidence_fields: Iterable[str] = ()) -> Dict[str, str]:
+        """Record a fresh look at a lead, writing only fields whose value changed.
+
+        Empty values are treated as "not observed" rather than "removed", since
+        cheaper fetch paths can't see every field. `low_confidence_fields` (e.g.
+        links guessed from bio text) only fill a field that is still empty, so
+        they never overwrite a value taken from the profile itself. Returns
+        {field: new_value} for the fields that changed (every non-empty field
+        for a new lead).
+        """
+        low_confidence_fields = set(low_confidence_fields)
+        now = time.time()
+        observed = {field: (fields.get(field) or '').strip() for field in LEAD_FIELDS}
+        observed = {field: value for field, value in observed.items() if value}
+
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM leads WHERE url = ?", (url,)).fetchone()
+
+            if row is None:
+                columns = ['url', *observed.keys(), 'first_seen', 'last_checked', 'check_count']
+                values = [url, *observed.values(), now, now, 1]
+                conn.execute(
+                    f"INSERT INTO leads ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    values
+                )
+                return observed
+
+            changes = {
+                field: value for field, value in observed.items()
+                if field_changed(field, row[field], value)
+                and not (field in low_confidence_fields and row[field])
+            }
+            if not changes:
+                conn.execute(
+                    "UPDATE leads SET last_checked = ?, check_count = check_count + 1, failure_count = 0 WHERE url = ?",
+                    (now, url)
+                )
+                return {}
+
+            assignments = ', '.join(f"{field} = ?" for field in changes)
+            conn.execute(
+                f"UPDATE leads SET {assignments}, last_checked = ?, last_changed = ?, failure_count = 0, "
+                f"check_count = check_count + 1, change_count = change_count + 1 WHERE url = ?",
+                (*changes.values(), now, now, url)
+            )
+            conn.executemany(
+                "INSERT INTO lead_changes (url, field, old_value, new_value, source, changed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(url, field, row[field], value, source, now) for field, value in changes.items()]
+            )
+            return changes
+
+    def record_failed_check(self, url: str):
+        """Note that a lead's profile could not be fetched, so it backs off instead of blocking the queue."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE leads SET last_checked = ?, check_count = check_count + 1, "
+                "failure_count = failure_count + 1 WHERE url = ?",
+                (time.time(), url)
+            )
+
+    def due_for_refresh(self, limit: int, min_age_seconds: float) -> List[Dict]:
+        """Leads not checked for at least `min_age_seconds`, highest refresh priority first.
+
+        Priority = staleness x lead value x observed change rate, where leads
+        with an Instagram or email are worth more and the change rate is
+        smoothed so never-changed leads still get revisited. Leads whose last
+        fetches failed wait min_age x 2^failures before they are due again.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT *,
+                    (? - last_checked)
+                    * (1.0 + 2.0 * (instagram != '') + 1.0 * (email != ''))
+                    * ((change_count + 1.0) / (check_count + 2.0)) AS priority
+                FROM leads
+                WHERE last_checked <= ? - ? * (1 << MIN(failure_count, ?))
+                ORDER BY priority DESC
+                LIMIT ?
+            """, (now, now, min_age_seconds, MAX_FAILURE_BACKOFF, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def iter_leads(self, fields: Iterable[str] = LEAD_COLUMNS, require_instagram: bool = False,
+                   require_email: bool = False, batch_size: int = 1000) -> Iterator[List[Dict]]:
+        """Yield leads in batches of `batch_size`, oldest first.
+
+        Each batch is read with its own short query (keyset pagination on
+        rowid), so memory stays constant and no read transaction is held open
+        while the caller is busy with a batch.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        fields = list(fields)
+        unknown = [field for field in fields if field not in LEAD_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown lead fields: {', '.join(unknown)}")
+
+        columns = ', '.join(['rowid', *fields])
+        conditions = ['rowid > ?']
+        if require_instagram:
+            conditions.append("instagram LIKE '%instagram.com%'")
+        if require_email:
+            conditions.append("email != ''")
+
+        last_rowid = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM leads WHERE {' AND '.join(conditions)} ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1]['rowid']
+            yield [{field: row[field] for field in fields} for row in rows]
+
+    def recent_changes(self, limit: int = 100) -> List[Dict]:
+        """The `limit` most recent field changes, newest first."""
+        if not 1 <= limit <= MAX_CHANGES_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_CHANGES_LIMIT}, got {limit}")
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT url, field, old_value, new_value, source, changed_at "
+                "FROM lead_changes ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_lead_store() -> LeadStore:
+    """Process-wide LeadStore instance."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = LeadStore()
+        return _shared_store
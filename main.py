@@ -1,10 +1,24 @@
+import startup_report  # First, so boot time is measured from here
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import os
+import socket
+import threading
+import time
 import uvicorn
 from artist_lead_scraper import ArtistLeadScraper
+from scrape_scheduler import ScrapeScheduler
+from lead_filters import has_instagram
+from lead_store import get_lead_store
+from lead_refresher import LeadRefresher
+from job_queue import get_job_queue
+from lead_export import EXPORT_FORMATS, export_leads, export_filename
+from driver_manager import DriverManager
+
+startup_report.mark("imports loaded")
 
 app = FastAPI(
     title="Artist Lead Scraper API",
@@ -27,6 +41,18 @@ app.add_middleware(
 
 class ScrapeRequest(BaseModel):
     searchTerm: str
+    # Time budget; partial results are returned when it runs out. Budgets too small for
+    # one search page plus one profile after the YouTube stage (under ~12s) return no leads.
+    deadlineSeconds: Optional[float] = None
+
+class JobRequest(BaseModel):
+    model_config = {"extra": "forbid"}  # Reject options (e.g. deadlineSeconds) that queued jobs don't support
+    
+    searchTerm: str
+
+class JobCreated(BaseModel):
+    jobId: str
+    status: str
 
 class ArtistLead(BaseModel):
     url: str
@@ -38,10 +64,55 @@ class ArtistLead(BaseModel):
     website: str
     bio: str
 
+lead_refresher = None
+
+@app.on_event("startup")
+async def start_lead_refresher():
+    global lead_refresher
+    if os.environ.get("LEAD_REFRESH_ENABLED", "").lower() in ("1", "true", "yes"):
+        lead_refresher = LeadRefresher()
+        lead_refresher.start()
+
+def _watch_startup(port: int):
+    """Wait until uvicorn accepts connections, then optionally pre-warm the browser."""
+    give_up_at = time.monotonic() + 60
+    while time.monotonic() < give_up_at:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                break
+        except OSError:
+            time.sleep(0.05)
+    else:
+        return
+    startup_report.mark("listening")
+    
+    if os.environ.get("PREWARM_BROWSER", "").lower() in ("1", "true", "yes"):
+        DriverManager.prewarm()
+
+@app.on_event("startup")
+async def start_startup_watcher():
+    startup_report.mark("app startup")
+    port = int(os.environ.get("PORT", 8000))
+    threading.Thread(target=_watch_startup, args=(port,), name="startup-watcher", daemon=True).start()
+
+@app.on_event("shutdown")
+async def stop_lead_refresher():
+    if lead_refresher:
+        lead_refresher.stop()
+
 class ScrapeResponse(BaseModel):
     success: bool
     data: List[ArtistLead]
     count: int
+    partial: bool = False  # True when the deadline or an error cut the scrape short
+
+class JobResponse(BaseModel):
+    jobId: str
+    searchTerm: str
+    status: str  # queued | running | done | failed
+    tasks: Dict[str, int]
+    data: List[ArtistLead]
+    count: int
 
 @app.get("/")
 async def root():
@@ -50,17 +121,24 @@ async def root():
         "endpoints": {
             "root": "GET /",
             "health": "GET /health",
-            "scrape": "POST /scrape"
+            "scrape": "POST /scrape",
+            "create_job": "POST /jobs",
+            "job": "GET /jobs/{jobId}",
+            "lead_changes": "GET /leads/changes",
+            "startup": "GET /startup",
+            "export": "GET /leads/export?format=csv|jsonl|parquet&fields=url,name&requireInstagram=true&requireEmail=false&gzip=false"
         },
         "usage": {
             "scrape": {
                 "method": "POST",
                 "url": "/scrape",
                 "body": {
-                    "searchTerm": "string (required)"
+                    "searchTerm": "string (required)",
+                    "deadlineSeconds": "number (optional) - time budget in seconds"
                 },
                 "example": {
-                    "searchTerm": "Drake"
+                    "searchTerm": "Drake",
+                    "deadlineSeconds": 120
                 }
             }
         }
@@ -68,63 +146,139 @@ async def root():
 
 @app.post("/scrape", response_model=ScrapeResponse)
 async def scrape_leads(request: ScrapeRequest):
+    search_term = request.searchTerm
+    
+    if not search_term:
+        raise HTTPException(status_code=400, detail="Search term is required")
+    
+    if request.deadlineSeconds is not None and request.deadlineSeconds <= 0:
+        raise HTTPException(status_code=400, detail="deadlineSeconds must be positive")
+
+    print(f'\n🚀 STARTING SCRAPE PROCESS FOR: "{search_term}"')
+    if request.deadlineSeconds is not None:
+        print(f"⏱️ Time budget: {request.deadlineSeconds}s")
+    print("=" * 60)
+    
+    scheduler = ScrapeScheduler(request.deadlineSeconds)
+    startup_report.mark("first scrape started")
+    
     try:
-        search_term = request.searchTerm
+        scraper = ArtistLeadScraper()
+    except Exception as e:
+        print(f"❌ ERROR DURING SCRAPING: {str(e)}")
+        raise HTTPException(status_code=500, detail="An error occurred during scraping")
+    
+    # Everything collected so far is returned even if a later stage fails or runs out of time
+    all_artists = []
+    try:
+        # STEP 1: Get top 5 producers from YouTube
+        print(f'🎵 STEP 1: Searching YouTube for "{search_term} Type Beat" producers...')
+        producers = scraper.search_youtube_producers(search_term, num_results=5, deadline=scheduler.youtube_deadline())
+        print(f"📺 Found {len(producers)} producers: {producers}")
         
-        if not search_term:
-            raise HTTPException(status_code=400, detail="Search term is required")
-
-        print(f'\n🚀 STARTING SCRAPE PROCESS FOR: "{search_term}"')
-        print("=" * 60)
+        if not producers:
+            print("❌ No producers found on YouTube!")
+            return ScrapeResponse(success=True, data=[], count=0, partial=scheduler.partial)
         
-        scraper = ArtistLeadScraper()
+        # Drop the lowest-ranked producers the budget can't cover
+        producers = scheduler.plan_producers(producers)
         
-        try:
-            # STEP 1: Get top 5 producers from YouTube
-            print(f'🎵 STEP 1: Searching YouTube for "{search_term} Type Beat" producers...')
-            producers = scraper.search_youtube_producers(search_term, num_results=5)
-            print(f"📺 Found {len(producers)} producers: {producers}")
-            
-            if not producers:
-                print("❌ No producers found on YouTube!")
-                return ScrapeResponse(success=True, data=[], count=0)
-            
-            # STEP 2-3: For each producer, search SoundCloud and scrape artists
-            all_artists = []
-            for i, producer in enumerate(producers):
-                print(f'\n🔍 STEP 2-3: Processing producer {i+1}/{len(producers)}: "{producer}"')
-                artists = scraper.search_soundcloud_artists(producer)
-                all_artists.extend(artists)
-                print(f"Found {len(artists)} artists for producer '{producer}'")
-            
-            print(f"\n📊 TOTAL ARTISTS FOUND: {len(all_artists)}")
-            
-            # STEP 4: Filter for artists with Instagram
-            leads_with_instagram = []
-            for artist in all_artists:
-                if (artist and 
-                    artist.get('instagram') and 
-                    isinstance(artist['instagram'], str) and 
-                    artist['instagram'].strip() != '' and 
-                    'instagram.com' in artist['instagram'].lower()):
-                    leads_with_instagram.append(artist)
-                    print(f"✅ FINAL LEAD: {artist.get('name')} - {artist.get('instagram')}")
-            
-            print(f"\n🎯 FINAL RESULTS: {len(leads_with_instagram)} artists with Instagram")
-            print("=" * 60)
-            
-            return ScrapeResponse(
-                success=True,
-                data=leads_with_instagram,
-                count=len(leads_with_instagram)
-            )
-            
-        finally:
-            scraper.close()
+        # STEP 2-3: For each producer, search SoundCloud and scrape artists
+        for i, producer in enumerate(producers):
+            if not scheduler.can_afford_producer():
+                scheduler.mark_partial(f"deadline reached before producer {i+1}/{len(producers)}")
+                break
             
+            print(f'\n🔍 STEP 2-3: Processing producer {i+1}/{len(producers)}: "{producer}"')
+            search_deadline, profile_deadline = scheduler.producer_deadlines(i, len(producers))
+            artists = scraper.search_soundcloud_artists(producer, scheduler, search_deadline, profile_deadline)
+            all_artists.extend(artists)
+            print(f"Found {len(artists)} artists for producer '{producer}'")
+        
     except Exception as e:
         print(f"❌ ERROR DURING SCRAPING: {str(e)}")
-        raise HTTPException(status_code=500, detail="An error occurred during scraping")
+        scheduler.mark_partial("error during scraping")
+        
+    finally:
+        scraper.close()
+    
+    print(f"\n📊 TOTAL ARTISTS FOUND: {len(all_artists)}")
+    
+    # Remember every scraped profile so the background refresher can keep it fresh
+    try:
+        get_lead_store().upsert_leads(all_artists)
+    except Exception as e:
+        print(f"⚠️ Could not save leads: {str(e)}")
+    
+    # STEP 4: Filter for artists with Instagram
+    leads_with_instagram = []
+    for artist in all_artists:
+        if has_instagram(artist):
+            leads_with_instagram.append(artist)
+            print(f"✅ FINAL LEAD: {artist.get('name')} - {artist.get('instagram')}")
+    
+    startup_report.mark("first scrape completed")
+    print(f"\n🎯 FINAL RESULTS: {len(leads_with_instagram)} artists with Instagram{' (partial)' if scheduler.partial else ''}")
+    print("=" * 60)
+    
+    return ScrapeResponse(
+        success=True,
+        data=leads_with_instagram,
+        count=len(leads_with_instagram),
+        partial=scheduler.partial
+    )
+
+@app.post("/jobs", response_model=JobCreated, status_code=202)
+async def create_job(request: JobRequest):
+    """Queue a scrape for the worker pool (see worker.py) instead of running it in this process."""
+    if not request.searchTerm:
+        raise HTTPException(status_code=400, detail="Search term is required")
+    job_id = get_job_queue().create_job(request.searchTerm)
+    print(f'📥 Queued scrape job {job_id} for: "{request.searchTerm}"')
+    return JobCreated(jobId=job_id, status="queued")
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    job = get_job_queue().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(
+        jobId=job['id'],
+        searchTerm=job['search_term'],
+        status=job['status'],
+        tasks=job['tasks'],
+        data=job['leads'],
+        count=len(job['leads'])
+    )
+
+@app.get("/leads/changes")
+async def lead_changes(limit: int = 100):
+    """Most recent field changes detected by scrapes and the background refresher."""
+    try:
+        return {"changes": get_lead_store().recent_changes(limit)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/leads/export")
+def export_leads_endpoint(format: str = "csv", fields: Optional[str] = None, requireInstagram: bool = False,
+                          requireEmail: bool = False, gzip: bool = False):
+    """Stream every stored lead in chunks; the generator runs in the threadpool so the API stays responsive."""
+    selected = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    try:
+        chunks = export_leads(format, selected, requireInstagram, requireEmail, gzip)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    headers = {"Content-Disposition": f'attachment; filename="{export_filename(format, gzip)}"'}
+    media_type = "application/gzip" if gzip else EXPORT_FORMATS[format]
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+@app.get("/startup")
+async def startup_timings():
+    """Where boot time went: interpreter start, imports, app startup, port bound, browser pre-warm, first scrape."""
+    return startup_report.report()
 
 @app.get("/health")
 async def health_check():
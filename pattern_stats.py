@@ -0,0 +1,158 @@
+import json
+import os
+import random
+import threading
+from contextlib import contextmanager
+from typing import Dict, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+DEFAULT_STATS_PATH = os.environ.get("PATTERN_STATS_PATH", "pattern_stats.json")
+
+
+class PatternStats:
+    """Per-template yield of SoundCloud search patterns, persisted to a JSON file.
+
+    Each template (e.g. "prod {producer}") records how many times it was tried,
+    how many new artists it surfaced and how many of those turned into
+    qualified leads. `order()` uses this to put productive templates first,
+    prune ones that consistently add nothing, and occasionally explore a
+    low-ranked template so its stats don't go stale.
+    """
+
+    LEAD_WEIGHT = 3.0      # A qualified lead is worth this many plain new artists
+    PRIOR_TRIES = 2        # Smoothing so untried templates start near the middle
+    PRIOR_SCORE = 2.0
+    MIN_TRIES_TO_PRUNE = 5
+    PRUNE_BELOW = 1.0      # Score under which a well-tried template is pruned
+    EXPLORE_RATE = 0.15
+
+    def __init__(self, path: str = DEFAULT_STATS_PATH, explore_rate: float = EXPLORE_RATE):
+        self.path = path
+        self.explore_rate = explore_rate
+        self._lock = threading.Lock()
+        self.stats = self._load()
+        self._pending = {}  # Counts recorded since the last save
+
+    def _load(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ Could not load pattern stats from {self.path}: {str(e)}")
+            return {}
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialise saves across worker processes sharing the stats file."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self):
+        """Merge counts recorded since the last save into the file and write it atomically.
+
+        Re-reading the file first means several processes can learn into the
+        same stats file without overwriting each other's counts.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with self._file_lock():
+                merged = self._load()
+                for template, counts in pending.items():
+                    entry = self._entry(merged, template)
+                    for key, value in counts.items():
+                        entry[key] += value
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(merged, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            with self._lock:
+                # Keep anything recorded while we were writing on top of the merged view
+                for template, counts in self._pending.items():
+                    entry = self._entry(merged, template)
+                    for key, value in counts.items():
+                        entry[key] += value
+                self.stats = merged
+        except Exception as e:
+            print(f"⚠️ Could not save pattern stats to {self.path}: {str(e)}")
+            with self._lock:
+                for template, counts in pending.items():
+                    entry = self._entry(self._pending, template)
+                    for key, value in counts.items():
+                        entry[key] += value
+
+    @staticmethod
+    def _entry(stats: Dict, template: str) -> Dict[str, int]:
+        return stats.setdefault(template, {'tries': 0, 'new_artists': 0, 'qualified_leads': 0})
+
+    def _add(self, template: str, **counts: int):
+        with self._lock:
+            for stats in (self.stats, self._pending):
+                entry = self._entry(stats, template)
+                for key, value in counts.items():
+                    entry[key] += value
+
+    def record_search(self, template: str, new_artists: int):
+        self._add(template, tries=1, new_artists=new_artists)
+
+    def record_lead(self, template: str):
+        self._add(template, qualified_leads=1)
+
+    def score(self, template: str) -> float:
+        """Expected value of one page load for this template."""
+        entry = self.stats.get(template, {})
+        tries = entry.get('tries', 0)
+        value = entry.get('new_artists', 0) + self.LEAD_WEIGHT * entry.get('qualified_leads', 0)
+        return (value + self.PRIOR_SCORE * self.PRIOR_TRIES) / (tries + self.PRIOR_TRIES)
+
+    def order(self, templates: List[str]) -> List[str]:
+        """Return the templates to try, best first, with pruned ones dropped.
+
+        With probability `explore_rate` one template that would otherwise be
+        pruned or ranked in the bottom half is tried right after the best one.
+        """
+        with self._lock:
+            ranked = sorted(templates, key=lambda t: (-self.score(t), templates.index(t)))
+            kept = [t for t in ranked if not self._pruned(t)]
+        if not kept:
+            kept = ranked[:1]
+
+        low_ranked = [t for t in ranked if t not in kept or ranked.index(t) >= len(ranked) // 2]
+        if low_ranked and random.random() < self.explore_rate:
+            explored = random.choice(low_ranked)
+            kept = [t for t in kept if t != explored]
+            kept.insert(min(1, len(kept)), explored)
+        return kept
+
+    def _pruned(self, template: str) -> bool:
+        entry = self.stats.get(template, {})
+        return entry.get('tries', 0) >= self.MIN_TRIES_TO_PRUNE and self.score(template) < self.PRUNE_BELOW
+
+
+_shared_stats = None
+_shared_lock = threading.Lock()
+
+
+def get_pattern_stats() -> PatternStats:
+    """Process-wide PatternStats instance so every scraper learns from the same data."""
+    global _shared_stats
+    with _shared_lock:
+        if _shared_stats is None:
+            _shared_stats = PatternStats()
+        return _shared_stats
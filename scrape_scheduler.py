@@ -0,0 +1,151 @@
+import time
+from typing import List, Optional, Tuple
+
+
+class Deadline:
+    """A point in time after which a piece of scraping work should stop."""
+
+    def __init__(self, seconds: Optional[float] = None, parent: Optional['Deadline'] = None):
+        now = time.monotonic()
+        expires_at = None if seconds is None else now + max(0.0, seconds)
+        if parent is not None and parent.expires_at is not None:
+            expires_at = parent.expires_at if expires_at is None else min(expires_at, parent.expires_at)
+        self.expires_at = expires_at
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (infinite when there is no deadline)."""
+        if self.expires_at is None:
+            return float('inf')
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def child(self, seconds: Optional[float]) -> 'Deadline':
+        """Create a deadline that never outlives this one."""
+        return Deadline(seconds, parent=self)
+
+
+class ScrapeScheduler:
+    """Splits a scrape's time budget across the YouTube, search and profile stages.
+
+    Budgets are soft: every stage gets a share of what is left when it starts,
+    so time a stage does not use rolls forward to later stages. Observed page
+    load costs are tracked so work that can no longer finish in time is skipped.
+    """
+
+    YOUTUBE_SHARE = 0.1
+    SEARCH_SHARE = 0.4  # of each producer's slice; the rest goes to profile scraping
+
+    # Initial per-page cost estimates (seconds), refined as pages are loaded
+    DEFAULT_COSTS = {
+        'youtube': 3.0,
+        'search': 4.0,
+        'profile': 6.0,
+    }
+
+    # Keep this much of the budget to build the response
+    RESERVE_SECONDS = 1.0
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        self.budget_seconds = budget_seconds
+        if budget_seconds is None:
+            self.deadline = Deadline()
+        else:
+            self.deadline = Deadline(max(0.0, budget_seconds - self.RESERVE_SECONDS))
+        self.costs = dict(self.DEFAULT_COSTS)
+        self.partial = False
+
+    @property
+    def has_budget(self) -> bool:
+        return self.budget_seconds is not None
+
+    def youtube_deadline(self) -> Deadline:
+        if not self.has_budget:
+            return self.deadline.child(None)
+        return self.deadline.child(self.deadline.remaining() * self.YOUTUBE_SHARE)
+
+    def plan_producers(self, producers: List[str]) -> List[str]:
+        """Keep only the top-ranked producers that the remaining budget can cover.
+
+        Each kept producer must be able to afford at least one search page and
+        one profile scrape, so a tight budget drops the lowest-ranked producers
+        instead of starving the best ones. A budget too small for even one
+        producer (see `can_afford_producer`) keeps none, and the scrape returns
+        an empty partial result.
+        """
+        if not self.has_budget:
+            return producers
+        fit = int(self.deadline.remaining() // self._producer_cost())
+        if fit < len(producers):
+            self.mark_partial(f"budget covers {fit} of {len(producers)} producers")
+            return producers[:fit]
+        return producers
+
+    def can_afford_producer(self) -> bool:
+        """Whether one more producer (a search page plus a profile scrape) fits in the budget."""
+        if not self.has_budget:
+            return True
+        return self.deadline.remaining() >= self._producer_cost()
+
+    def _producer_cost(self) -> float:
+        return self.costs['search'] + self.costs['profile']
+
+    def producer_deadlines(self, index: int, total: int) -> Tuple[Deadline, Deadline]:
+        """Return the (search, profiles) deadlines for producer `index` of `total`.
+
+        The search share never drops below one search page, and the profile
+        deadline leaves room for at least one profile after it.
+        """
+        if not self.has_budget:
+            return self.deadline.child(None), self.deadline.child(None)
+        slice_seconds = self.deadline.remaining() / max(1, total - index)
+        search_seconds = max(slice_seconds * self.SEARCH_SHARE, self.costs['search'])
+        return (
+            self.deadline.child(search_seconds),
+            self.deadline.child(max(slice_seconds, search_seconds + self.costs['profile'])),
+        )
+
+    def record(self, stage: str, seconds: float):
+        """Fold an observed page load time into the running cost estimate."""
+        previous = self.costs.get(stage, seconds)
+        self.costs[stage] = 0.7 * previous + 0.3 * seconds
+
+    def can_afford(self, deadline: Deadline, stage: str) -> bool:
+        """Whether one more `stage` page load is expected to fit before `deadline`."""
+        if deadline.expires_at is None:
+            return True
+        return deadline.remaining() >= self.costs.get(stage, 0.0)
+
+    def affordable_count(self, deadline: Deadline, stage: str, wanted: int) -> int:
+        """How many of `wanted` page loads are expected to fit before `deadline`."""
+        if deadline.expires_at is None:
+            return wanted
+        cost = self.costs.get(stage) or 1.0
+        return min(wanted, int(deadline.remaining() // cost))
+
+    def should_continue_search(self, deadline: Deadline, last_pattern_yield: Optional[int], artists_found: int) -> bool:
+        """Decide whether to load another search page for the current producer.
+
+        Once less than half of the search budget is left and we already have
+        artists to scrape, patterns that stopped producing new artists are
+        treated as low-yield and the remaining ones are skipped.
+        """
+        if not self.can_afford(deadline, 'search'):
+            return False
+        if deadline.expires_at is None or last_pattern_yield is None:
+            return True
+        under_pressure = deadline.remaining() < 2 * self.costs['search']
+        return not (under_pressure and artists_found > 0 and last_pattern_yield == 0)
+
+    def page_timeout(self, deadline: Deadline, default: float = 300.0) -> float:
+        """Page load timeout that keeps a single request from overrunning `deadline`.
+
+        Without a deadline this is Selenium's own default of 300 seconds.
+        """
+        return max(1.0, min(default, deadline.remaining()))
+
+    def mark_partial(self, reason: str):
+        if not self.partial:
+            print(f"⏱️ Returning partial results: {reason}")
+        self.partial = True
@@ -1,147 +1,210 @@
-from bs4 import BeautifulSoup
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from artist_info_extractor import ArtistInfoExtractor
+from scrape_scheduler import ScrapeScheduler, Deadline
+from pattern_stats import PatternStats, get_pattern_stats
+from lead_filters import has_instagram
 
 class SoundCloudScraper:
-    def __init__(self, driver):
+    # More comprehensive search patterns; tried in the order learned by PatternStats
+    SEARCH_TEMPLATES = [
+        "{producer}",  # Direct name search
+        "prod {producer}",
+        "prod. {producer}",
+        "produced by {producer}",
+        "{producer} type beat",
+        "{producer} beat",
+        "ft {producer}",  # Featured producer
+        "x {producer}",   # Collaboration format
+    ]
+    
+    def __init__(self, driver, pattern_stats: PatternStats = None):
         self.driver = driver
         self.artist_extractor = ArtistInfoExtractor(driver)
+        self.pattern_stats = pattern_stats or get_pattern_stats()
     
-    def search_soundcloud_artists(self, producer_name: str) -> List[Dict]:
-        """Search SoundCloud for artists using beats from the producer."""
+    def search_soundcloud_artists(self, producer_name: str, scheduler: ScrapeScheduler = None,
+                                  search_deadline: Deadline = None, profile_deadline: Deadline = None) -> List[Dict]:
+        """Search SoundCloud for artists using beats from the producer.
+
+        When a scheduler is given, search patterns and profile scrapes stop as
+        their deadlines approach and whatever was scraped so far is returned.
+        """
+        scheduler = scheduler or ScrapeScheduler()
+        profile_deadline = profile_deadline or scheduler.deadline
+        processed_artists = []
         try:
-            print(f"\n🔍 STEP 2: Searching SoundCloud for producer: '{producer_name}'")
+            artist_templates = self.find_artist_urls(producer_name, scheduler, search_deadline)
             
-            # More comprehensive search patterns
-            search_patterns = [
-                f"{producer_name}",  # Direct name search
-                f"prod {producer_name}",
-                f"prod. {producer_name}",
-                f"produced by {producer_name}",
-                f"{producer_name} type beat",
-                f"{producer_name} beat",
-                f"ft {producer_name}",  # Featured producer
-                f"x {producer_name}",   # Collaboration format
-            ]
+            if not artist_templates:
+                print(f"   ❌ No valid artist profiles found for producer '{producer_name}'")
+                return []
             
-            all_artist_urls = set()
+            # STEP 3: Scrape each artist's info
+            print(f"\n📊 STEP 3: Scraping artist information...")
             
-            for pattern_index, search_pattern in enumerate(search_patterns):
-                if len(all_artist_urls) >= 20:  # Increased target
+            artist_urls = list(artist_templates)[:15]  # Process more artists
+            for i, artist_url in enumerate(artist_urls):
+                if not scheduler.can_afford(profile_deadline, 'profile'):
+                    print(f"   ⏱️ Profile budget spent, skipping {len(artist_urls) - i} remaining artists")
+                    scheduler.mark_partial(f"profile scraping for '{producer_name}' cut short")
                     break
-                    
-                search_url = f"https://soundcloud.com/search?q={search_pattern.replace(' ', '%20')}"
                 
-                print(f"   Pattern {pattern_index + 1}/{len(search_patterns)}: '{search_pattern}'")
+                print(f"   Scraping artist {i+1}/{len(artist_urls)}: {artist_url}")
+                page_started = time.monotonic()
+                self.driver.set_page_load_timeout(scheduler.page_timeout(profile_deadline))
+                artist_info = self.scrape_artist(artist_url, artist_templates[artist_url])
+                scheduler.record('profile', time.monotonic() - page_started)
                 
-                try:
-                    self.driver.get(search_url)
-                    time.sleep(2)
-                    
-                    # Get page source and parse
-                    soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                    
-                    # More comprehensive link selectors
-                    track_selectors = [
-                        'a[href^="/"][title]',  # Original working selector
-                        'article a[href^="/"]',  # Article links
-                        '.trackItem a[href^="/"]',  # Track items
-                        '.soundTitle a[href^="/"]',  # Sound titles
-                        '.userItem a[href^="/"]',  # User items
-                        'h2 a[href^="/"]',  # Headers
-                        '.sc-link-primary[href^="/"]',  # SoundCloud primary links
-                    ]
-                    
-                    pattern_links = []
-                    for selector in track_selectors:
-                        try:
-                            links = soup.select(selector)
-                            pattern_links.extend(links)
-                        except Exception:
-                            continue
-                    
-                    print(f"   Found {len(pattern_links)} potential links")
-                    
-                    # Process links to extract artist profiles
-                    pattern_artists = 0
-                    for link in pattern_links[:30]:  # Process more links per pattern
-                        try:
-                            href = link.get('href', '')
-                            if not href or not href.startswith('/'):
-                                continue
-                            
-                            # More comprehensive system path filtering
-                            system_paths = [
-                                '/search', '/tracks', '/sets', '/discover', '/you', '/stream', 
-                                '/feed', '/upload', '/terms-of-use', '/pages', '/imprint', 
-                                '/charts', '/premium', '/pro', '/mobile', '/apps', '/help',
-                                '/jobs', '/developers', '/blog', '/creators', '/copyright',
-                                '/privacy', '/community-guidelines', '/advertising', '/legal'
-                            ]
-                            
-                            if any(skip in href.lower() for skip in system_paths):
-                                continue
-                            
-                            # Extract artist profile URL - handle both direct profiles and track URLs
-                            url_parts = href.strip('/').split('/')
-                            if len(url_parts) >= 1:
-                                artist_path = url_parts[0]
-                                
-                                # Validate artist path
-                                if (artist_path and 
-                                    len(artist_path) > 1 and 
-                                    not artist_path.isdigit() and
-                                    not any(skip in artist_path.lower() for skip in ['track', 'set', 'playlist', 'likes', 'reposts', 'followers', 'following'])):
-                                    
-                                    artist_url = f"https://soundcloud.com/{artist_path}"
-                                    
-                                    if artist_url not in all_artist_urls:
-                                        all_artist_urls.add(artist_url)
-                                        pattern_artists += 1
-                                        print(f"   🎤 Found artist: {artist_url}")
-                                        
-                                        if len(all_artist_urls) >= 20:
-                                            break
-                                
-                        except Exception:
-                            continue
-                    
-                    print(f"   Added {pattern_artists} new artists from this pattern")
-                    
-                except Exception as e:
-                    print(f"   ❌ Error with pattern '{search_pattern}': {str(e)}")
-                    continue
+                if artist_info:
+                    processed_artists.append(artist_info)
             
-            print(f"   🎯 Total unique artists found: {len(all_artist_urls)}")
+            print(f"🎯 STEP 2-3 COMPLETE: Found {len(processed_artists)} valid artists for producer '{producer_name}'")
+            return processed_artists
             
-            if not all_artist_urls:
-                print(f"   ❌ No valid artist profiles found for producer '{producer_name}'")
-                return []
+        except Exception as e:
+            print(f"❌ Error searching SoundCloud for '{producer_name}': {str(e)}")
+            if processed_artists:
+                scheduler.mark_partial(f"SoundCloud search for '{producer_name}' failed midway")
+            return processed_artists
+        
+        finally:
+            self.pattern_stats.save()
+    
+    def find_artist_urls(self, producer_name: str, scheduler: ScrapeScheduler = None,
+                         search_deadline: Deadline = None) -> Dict[str, str]:
+        """STEP 2: Collect artist profile URLs from SoundCloud searches for the producer.
+
+        Returns {artist_url: search template that first found it}, in discovery order.
+        """
+        scheduler = scheduler or ScrapeScheduler()
+        search_deadline = search_deadline or scheduler.deadline
+        from bs4 import BeautifulSoup
+        
+        print(f"\n🔍 STEP 2: Searching SoundCloud for producer: '{producer_name}'")
+        
+        search_templates = self.pattern_stats.order(self.SEARCH_TEMPLATES)
+        
+        artist_templates = {}  # artist URL -> template that first found it
+        last_pattern_yield = None
+        
+        for pattern_index, search_template in enumerate(search_templates):
+            search_pattern = search_template.format(producer=producer_name)
+            if len(artist_templates) >= 20:  # Increased target
+                break
             
-            # STEP 3: Scrape each artist's info
-            print(f"\n📊 STEP 3: Scraping artist information...")
+            if not scheduler.should_continue_search(search_deadline, last_pattern_yield, len(artist_templates)):
+                print(f"   ⏱️ Search budget spent, skipping {len(search_templates) - pattern_index} remaining patterns")
+                scheduler.mark_partial(f"search for '{producer_name}' cut short")
+                break
+                
+            search_url = f"https://soundcloud.com/search?q={search_pattern.replace(' ', '%20')}"
             
-            processed_artists = []
-            for i, artist_url in enumerate(list(all_artist_urls)[:15]):  # Process more artists
-                try:
-                    print(f"   Scraping artist {i+1}/{min(15, len(all_artist_urls))}: {artist_url}")
-                    artist_info = self.artist_extractor.scrape_artist_info(artist_url)
-                    
-                    if artist_info and artist_info.get('name'):
-                        processed_artists.append(artist_info)
-                        instagram_status = artist_info.get('instagram', 'None')
-                        print(f"   ✅ Added: {artist_info.get('name')} - Instagram: {instagram_status}")
-                    else:
-                        print(f"   ❌ No valid info extracted")
+            print(f"   Pattern {pattern_index + 1}/{len(search_templates)}: '{search_pattern}'")
+            
+            try:
+                page_started = time.monotonic()
+                self.driver.set_page_load_timeout(scheduler.page_timeout(search_deadline))
+                self.driver.get(search_url)
+                time.sleep(min(2, search_deadline.remaining()))
+                scheduler.record('search', time.monotonic() - page_started)
+                
+                # Get page source and parse
+                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                
+                # More comprehensive link selectors
+                track_selectors = [
+                    'a[href^="/"][title]',  # Original working selector
+                    'article a[href^="/"]',  # Article links
+                    '.trackItem a[href^="/"]',  # Track items
+                    '.soundTitle a[href^="/"]',  # Sound titles
+                    '.userItem a[href^="/"]',  # User items
+                    'h2 a[href^="/"]',  # Headers
+                    '.sc-link-primary[href^="/"]',  # SoundCloud primary links
+                ]
+                
+                pattern_links = []
+                for selector in track_selectors:
+                    try:
+                        links = soup.select(selector)
+                        pattern_links.extend(links)
+                    except Exception:
+                        continue
+                
+                print(f"   Found {len(pattern_links)} potential links")
+                
+                # Process links to extract artist profiles
+                pattern_artists = 0
+                for link in pattern_links[:30]:  # Process more links per pattern
+                    try:
+                        href = link.get('href', '')
+                        if not href or not href.startswith('/'):
+                            continue
+                        
+                        # More comprehensive system path filtering
+                        system_paths = [
+                            '/search', '/tracks', '/sets', '/discover', '/you', '/stream', 
+                            '/feed', '/upload', '/terms-of-use', '/pages', '/imprint', 
+                            '/charts', '/premium', '/pro', '/mobile', '/apps', '/help',
+                            '/jobs', '/developers', '/blog', '/creators', '/copyright',
+                            '/privacy', '/community-guidelines', '/advertising', '/legal'
+                        ]
                         
-                except Exception as e:
-                    print(f"   ❌ Error scraping artist {i+1}: {str(e)}")
-                    continue
+                        if any(skip in href.lower() for skip in system_paths):
+                            continue
+                        
+                        # Extract artist profile URL - handle both direct profiles and track URLs
+                        url_parts = href.strip('/').split('/')
+                        if len(url_parts) >= 1:
+                            artist_path = url_parts[0]
+                            
+                            # Validate artist path
+                            if (artist_path and 
+                                len(artist_path) > 1 and 
+                                not artist_path.isdigit() and
+                                not any(skip in artist_path.lower() for skip in ['track', 'set', 'playlist', 'likes', 'reposts', 'followers', 'following'])):
+                                
+                                artist_url = f"https://soundcloud.com/{artist_path}"
+                                
+                                if artist_url not in artist_templates:
+                                    artist_templates[artist_url] = search_template
+                                    pattern_artists += 1
+                                    print(f"   🎤 Found artist: {artist_url}")
+                                    
+                                    if len(artist_templates) >= 20:
+                                        break
+                            
+                    except Exception:
+                        continue
+                
+                print(f"   Added {pattern_artists} new artists from this pattern")
+                self.pattern_stats.record_search(search_template, pattern_artists)
+                last_pattern_yield = pattern_artists
+                
+            except Exception as e:
+                print(f"   ❌ Error with pattern '{search_pattern}': {str(e)}")
+                last_pattern_yield = 0
+                continue
+        
+        print(f"   🎯 Total unique artists found: {len(artist_templates)}")
+        
+        return artist_templates
+    
+    def scrape_artist(self, artist_url: str, search_template: str = None) -> Optional[Dict]:
+        """STEP 3: Scrape one artist profile, crediting its search template if it is a qualified lead."""
+        try:
+            artist_info = self.artist_extractor.scrape_artist_info(artist_url)
             
-            print(f"🎯 STEP 2-3 COMPLETE: Found {len(processed_artists)} valid artists for producer '{producer_name}'")
-            return processed_artists
+            if artist_info and artist_info.get('name'):
+                if search_template and has_instagram(artist_info):
+                    self.pattern_stats.record_lead(search_template)
+                instagram_status = artist_info.get('instagram', 'None')
+                print(f"   ✅ Added: {artist_info.get('name')} - Instagram: {instagram_status}")
+                return artist_info
+            
+            print(f"   ❌ No valid info extracted")
+            return None
             
         except Exception as e:
-            print(f"❌ Error searching SoundCloud for '{producer_name}': {str(e)}")
-            return []
\ No newline at end of file
+            print(f"   ❌ Error scraping artist {artist_url}: {str(e)}")
+            return None
@@ -0,0 +1,58 @@
+"""Startup milestones for GET /startup.
+
+Cold starts are kept short by importing heavy dependencies (selenium,
+webdriver-manager, requests, bs4, pyarrow, psycopg2) inside the functions
+that use them rather than at module load, so booting the API only pays for
+FastAPI. Keep new heavy imports lazy the same way.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Imported first thing in main.py, so this is as close to "process start" as Python code gets
+_started = time.perf_counter()
+_marks: List[Dict] = []
+_lock = threading.Lock()
+
+
+def _process_age_seconds() -> Optional[float]:
+    """Seconds between exec() and now, read from /proc (Linux only)."""
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the ")" that closes the command name start at field 3; starttime is field 22
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except Exception:
+        return None
+
+
+# Time the interpreter spent booting before any of our code ran
+_interpreter_boot = _process_age_seconds()
+
+
+def mark(label: str):
+    """Record that a startup milestone was reached (only the first occurrence of a label counts)."""
+    elapsed = time.perf_counter() - _started
+    with _lock:
+        if any(entry['label'] == label for entry in _marks):
+            return
+        _marks.append({'label': label, 'seconds': round(elapsed, 3)})
+    print(f"⏱️ Startup: {label} at {elapsed:.2f}s")
+
+
+def report() -> Dict:
+    """Milestones with the time since the previous one, so it is clear where boot time goes."""
+    with _lock:
+        marks = list(_marks)
+    previous = 0.0
+    steps = []
+    for entry in marks:
+        steps.append({**entry, 'delta': round(entry['seconds'] - previous, 3)})
+        previous = entry['seconds']
+    return {
+        'interpreter_boot_seconds': round(_interpreter_boot, 3) if _interpreter_boot is not None else None,
+        'steps': steps,
+    }
@@ -0,0 +1,155 @@
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from job_queue import JobQueue, get_job_queue, SCRAPE_JOB, PRODUCER_CRAWL, PROFILE_SCRAPE
+from youtube_scraper import YouTubeScraper
+from lead_store import get_lead_store
+
+
+class Worker:
+    """Stateless worker that leases scrape tasks from the shared queue and runs them.
+
+    A scrape job fans out into one producer crawl per YouTube producer and one
+    profile scrape per artist URL, so any number of worker processes (or
+    machines, with the postgres JobQueue backend) can share the work of a
+    single job. The browser is started on the first task that needs it and
+    reused for the rest; if it dies during a task, the task is failed for
+    retry and the browser restarted.
+
+    Scraped profiles are also written to the LeadStore at LEADS_DB_PATH, so
+    for /leads/export to see them the API and workers must share that file
+    (one machine or one volume). Job results in GET /jobs/{id} come from the
+    queue and need no shared disk.
+    """
+
+    def __init__(self, queue: JobQueue = None, worker_id: str = None,
+                 poll_interval: float = float(os.environ.get("WORKER_POLL_INTERVAL", 2))):
+        self.queue = queue or get_job_queue()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        self._driver_manager = None
+        self._soundcloud_scraper = None
+        self.handlers = {
+            SCRAPE_JOB: self.handle_scrape_job,
+            PRODUCER_CRAWL: self.handle_producer_crawl,
+            PROFILE_SCRAPE: self.handle_profile_scrape,
+        }
+
+    @property
+    def soundcloud_scraper(self):
+        if self._soundcloud_scraper is None:
+            from driver_manager import DriverManager
+            from soundcloud_scraper import SoundCloudScraper
+            self._driver_manager = DriverManager(use_warm_driver=False)
+            self._soundcloud_scraper = SoundCloudScraper(self._driver_manager.get_driver())
+        return self._soundcloud_scraper
+
+    def run(self, max_tasks: int = None):
+        """Process tasks until interrupted (or until `max_tasks` have run)."""
+        print(f"👷 Worker {self.worker_id} started")
+        processed = 0
+        try:
+            while max_tasks is None or processed < max_tasks:
+                if not self.run_once():
+                    time.sleep(self.poll_interval)
+                    continue
+                processed += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def run_once(self) -> bool:
+        """Lease and run one task. Returns False if the queue had nothing available."""
+        task = self.queue.lease(self.worker_id)
+        if task is None:
+            return False
+
+        print(f"👷 {task['kind']} #{task['id']} (attempt {task['attempts']}) for job {task['job_id']}")
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._keep_lease, args=(task, heartbeat_stop), daemon=True)
+        heartbeat.start()
+        try:
+            result, children = self.handlers[task['kind']](task['payload'])
+            # The scrapers swallow page errors, so a dead browser shows up as an empty result
+            if self._driver_manager is not None and not self._driver_manager.is_alive():
+                raise Exception("browser session died during the task")
+        except Exception as e:
+            print(f"❌ Task #{task['id']} failed: {str(e)}")
+            self.queue.fail(task, self.worker_id, str(e))
+            self._reset_browser()
+            return True
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+
+        if not self.queue.complete(task, self.worker_id, result, children):
+            print(f"⚠️ Lease on task #{task['id']} expired before it finished; result discarded")
+        return True
+
+    def _keep_lease(self, task: Dict, stop: threading.Event):
+        """Extend the task's lease while it runs so slow crawls aren't handed to a second worker."""
+        interval = self.queue.visibility_timeout / 3
+        while not stop.wait(interval):
+            if not self.queue.extend_lease(task, self.worker_id):
+                print(f"⚠️ Lost lease on task #{task['id']}")
+                return
+
+    def handle_scrape_job(self, payload: Dict) -> Tuple[Optional[Dict], List]:
+        """STEP 1: Find producers on YouTube and fan out one crawl per producer."""
+        producers = YouTubeScraper.search_youtube_producers(payload['search_term'], num_results=5)
+        children = [(PRODUCER_CRAWL, {'producer': producer}, f"producer:{producer}") for producer in producers]
+        return {'producers': producers}, children
+
+    def handle_producer_crawl(self, payload: Dict) -> Tuple[Optional[Dict], List]:
+        """STEP 2: Search SoundCloud for the producer and fan out one scrape per artist."""
+        try:
+            artist_templates = self.soundcloud_scraper.find_artist_urls(payload['producer'])
+        finally:
+            self.soundcloud_scraper.pattern_stats.save()
+        children = [
+            (PROFILE_SCRAPE, {'url': url, 'template': template}, f"profile:{url}")
+            for url, template in list(artist_templates.items())[:15]
+        ]
+        return {'artists': len(children)}, children
+
+    def handle_profile_scrape(self, payload: Dict) -> Tuple[Optional[Dict], List]:
+        """STEP 3: Scrape one artist profile."""
+        try:
+            artist_info = self.soundcloud_scraper.scrape_artist(payload['url'], payload.get('template'))
+        finally:
+            self.soundcloud_scraper.pattern_stats.save()
+        if artist_info:
+            get_lead_store().upsert_leads([artist_info])
+        return artist_info, []
+
+    def _reset_browser(self):
+        """Drop the browser after a failure so the next task starts from a clean session."""
+        self.close()
+
+    def close(self):
+        if self._driver_manager is not None:
+            self._driver_manager.close()
+        self._driver_manager = None
+        self._soundcloud_scraper = None
+
+
+def _run_worker():
+    Worker().run()
+
+
+if __name__ == "__main__":
+    processes = int(os.environ.get("WORKER_PROCESSES", 1))
+    if processes <= 1:
+        _run_worker()
+    else:
+        workers = [multiprocessing.Process(target=_run_worker) for _ in range(processes)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
@@ -1,4 +1,3 @@
-import requests
 import re
 from typing import List
 import time
@@ -6,8 +5,10 @@ import json
 
 class YouTubeScraper:
     @staticmethod
-    def search_youtube_producers(search_term: str, num_results: int = 5) -> List[str]:
+    def search_youtube_producers(search_term: str, num_results: int = 5, timeout: float = 10) -> List[str]:
         """Search YouTube for beat producers using web scraping instead of the problematic library."""
+        import requests
+        
         try:
             search_query = f"{search_term} Type Beat"
             print(f"🎵 STEP 1: Searching YouTube for: '{search_query}'")
@@ -20,7 +21,7 @@ class YouTubeScraper:
             }
             
             print(f"   Fetching: {search_url}")
-            response = requests.get(search_url, headers=headers, timeout=10)
+            response = requests.get(search_url, headers=headers, timeout=timeout)
             
             if response.status_code != 200:
                 print(f"❌ YouTube request failed with status: {response.status_code}")